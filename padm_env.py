@@ -1,6 +1,7 @@
 import gymnasium as gym
 from gymnasium import spaces
 import random
+import numpy as np
 import pygame
 
 class HanoiTower(gym.Env):
@@ -12,8 +13,9 @@ class HanoiTower(gym.Env):
 
     Attributes:
         numDisks (int): Number of disks in the Tower of Hanoi.
-        agentState (tuple): Current state of the Tower of Hanoi represented as a tuple.
-        goalState (tuple): Goal state of the Tower of Hanoi represented as a tuple.
+        agentState (int): Current state packed as a base-3 integer, where disk i
+            contributes peg * 3**i.
+        goalState (int): Goal state packed as a base-3 integer (all disks on peg 2).
         actionSpace (gym.Space): Action space for the Tower of Hanoi environment.
         observationSpace (gym.Space): Observation space for the Tower of Hanoi environment.
         done (bool): Indicates whether the environment has reached a terminal state.
@@ -35,12 +37,18 @@ class HanoiTower(gym.Env):
         """
         super().__init__()
         self.numDisks = numDisks
-        self.agentState = numDisks * (0, )
-        self.goalState = numDisks * (2, ) 
+        self._pow3 = [3 ** i for i in range(numDisks)]
+        self.agentState = 0
+        self.goalState = sum(2 * p for p in self._pow3)
         self.reward = 0
         self.actionSpace = spaces.Discrete(6)
-        self.observationSpace = spaces.Tuple(self.numDisks*(spaces.Discrete(3) ,))
+        self.observationSpace = spaces.Discrete(3 ** numDisks)
         self.done = None
+        self._screen = None
+        self._clock = None
+        self._hanoi_surface = None
+        self._moves = [(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1)]
+        self._actionIndex = {move: index for index, move in enumerate(self._moves)}
         self.actionLookup = {0 : "(0,1) - top disk of pole 0 to top disk of pole 1 ",
                               1 : "(0,2) - top disk of pole 0 to top disk of pole 2 ",
                               2 : "(1,0) - top disk of pole 1 to top disk of pole 0 ",
@@ -53,56 +61,84 @@ class HanoiTower(gym.Env):
         Reset the environment to its initial state.
 
         Returns:
-            tuple: Initial state of the Tower of Hanoi.
+            int: Initial state of the Tower of Hanoi (all disks on peg 0).
         """
-        self.agentState = self.numDisks * (0, ) 
+        self.agentState = 0
         self.done = False
-        
+
         return (self.agentState)
     
     def step(self, action):
         """
             Execute a step in the environment given an action.
 
-            If the action is allowed (i.e., the move is valid according to the rules of the Tower of Hanoi),
-            the agent's state is updated to reflect the move. The reward is incremented by 0.001 and rounded
-            to three decimal places. If the updated state matches the goal state, the episode terminates
-            with an additional reward of 1 (total reward incremented by 1) and the environment's `done` flag 
-            is set to True, indicating that the goal has been reached. 
-
-            If the action is not allowed (i.e., the move violates the rules of the Tower of Hanoi),
-            the reward is decremented by 0.01 and rounded to three decimal places, and the `info` variable 
-            is set to "Invalid action". No state update is performed in this case.
+            The full transition and reward structure of the Tower of Hanoi is
+            precomputed into lookup tables (see `_buildTransitionTables`), so a
+            step is two table lookups plus a goal check. A valid move yields a
+            reward of -0.001, an invalid move leaves the state unchanged and
+            yields -0.1, and reaching the goal state yields +1 and terminates
+            the episode.
 
             Args:
-                action (int): Index of the action to be executed.
+                action (tuple): Move represented as (source peg, destination peg).
 
             Returns:
-                tuple: A tuple containing the next state (tuple), the cumulative reward (float), 
+                tuple: A tuple containing the next state (int), the cumulative reward (float),
                     a boolean indicating if the episode has terminated, and an info string.
             """
-        if self.moveAllowed(action):
-            diskToMove = min(self.disksOnPeg(action[0]))
-            movedState = list(self.agentState)
-            movedState[diskToMove] = action[1]
-            self.agentState = tuple(movedState)
-            #self.reward = round(self.reward - 0.001, 3)
-            self.reward = -0.001
-            info = "Move was successfull but did not reach goal"
-        else:
-            #self.reward = round(self.reward - 0.1, 3)
-            self.reward = -0.1
+        actionIdx = self._actionIndex[action]
+        nextState = int(self._next[self.agentState, actionIdx])
+        self.reward = float(self._reward[self.agentState, actionIdx])
+
+        if nextState == self.agentState:
             info = "Invalid action"
-        
-        if self.agentState == self.goalState:
-            #self.reward = round(self.reward + 1, 3)
-            self.reward = +1
+        else:
+            info = "Move was successfull but did not reach goal"
+
+        self.agentState = nextState
+        if nextState == self.goalState:
             self.done = True
             info = "Reached the goal"
 
         return self.agentState, self.reward, self.done, info
 
-            
+    def _buildTransitionTables(self):
+        """
+        Precompute the next-state and reward tables for all (state, action) pairs.
+
+        With only 3**numDisks states and 6 actions the whole MDP is static and
+        tiny, so the move validation and state update logic is evaluated once
+        here instead of on every call to `step`.
+
+        Returns:
+            None
+        """
+        numStates = 3 ** self.numDisks
+        self._next = np.zeros((numStates, 6), dtype=np.int32)
+        self._reward = np.zeros((numStates, 6), dtype=np.float32)
+        self._allowed = np.zeros((numStates, 6), dtype=bool)
+        savedState = self.agentState
+
+        for state in range(numStates):
+            self.agentState = state
+            masks = self._pegMasks()
+            for actionIdx, move in enumerate(self._moves):
+                srcMask = masks[move[0]]
+                dstMask = masks[move[1]]
+                if srcMask and (not dstMask or (srcMask & -srcMask) < (dstMask & -dstMask)):
+                    self._allowed[state, actionIdx] = True
+                    diskToMove = (srcMask & -srcMask).bit_length() - 1
+                    nextState = state + (move[1] - move[0]) * self._pow3[diskToMove]
+                    reward = -0.001
+                else:
+                    nextState = state
+                    reward = -0.1
+                if nextState == self.goalState:
+                    reward = 1.0
+                self._next[state, actionIdx] = nextState
+                self._reward[state, actionIdx] = reward
+
+        self.agentState = savedState
 
     def disksOnPeg(self, peg):
         """
@@ -114,31 +150,46 @@ class HanoiTower(gym.Env):
         Returns:
             list: List of disk indices on the specified peg.
         """
+        mask = self._pegMasks()[peg]
         listOfDisk = []
+        while mask:
+            lowBit = mask & -mask
+            listOfDisk.append(lowBit.bit_length() - 1)
+            mask ^= lowBit
+        return listOfDisk
+
+    def _pegMasks(self):
+        """
+        Compute per-peg disk bitmasks for the current state.
+
+        Bit i of mask p is set when disk i sits on peg p, so the smallest
+        disk on a peg is the lowest set bit of its mask.
+
+        Returns:
+            list: Three integer bitmasks, one per peg.
+        """
+        masks = [0, 0, 0]
+        state = self.agentState
         for disk in range(self.numDisks):
-            if self.agentState[disk] == peg:
-                listOfDisk.append(disk)
-        return listOfDisk        
-    
+            masks[state % 3] |= 1 << disk
+            state //= 3
+        return masks
+
     def moveAllowed(self, action):
         """
         Check if a given move is allowed.
 
+        The validity of every (state, action) pair is precomputed into the
+        `_allowed` table by `_buildTransitionTables`, so this is a single
+        indexed load.
+
         Args:
             action (tuple): Action representing the move.
 
         Returns:
             bool: True if the move is allowed, False otherwise.
         """
-        disks_from = self.disksOnPeg(action[0])
-        disks_to = self.disksOnPeg(action[1])
-
-        if disks_from:
-            if disks_to:
-                return min(disks_to) > min(disks_from)
-            else:
-                return True
-        return False
+        return bool(self._allowed[self.agentState, self._actionIndex[action]])
 
     def render(self):
         """
@@ -150,7 +201,10 @@ class HanoiTower(gym.Env):
         Peg1 = Blue
         Peg2 = Red
         Peg3 = Green
-        Whenever a disk is moved to a different peg, disk will be displayed in the respective peg color. 
+        Whenever a disk is moved to a different peg, disk will be displayed in the respective peg color.
+
+        Pygame is initialized and the background image loaded only on the
+        first call; subsequent calls reuse the cached window and surface.
 
         Note:
             This method should be called after making a successful move in the
@@ -159,22 +213,27 @@ class HanoiTower(gym.Env):
         Returns:
             None
         """
-        pygame.init()
-        pygame.display.set_caption("Hanoi Tower")
+        if self._screen is None:
+            pygame.init()
+            pygame.display.set_caption("Hanoi Tower")
+            size = (800, 400)
+            self._screen = pygame.display.set_mode(size)
+            self._clock = pygame.time.Clock()
+            self._hanoi_surface = pygame.image.load('.\HanoiTower_v5.png') # type: ignore
+
+        screen = self._screen
+        clock = self._clock
 
         RED = (255, 0, 0)
         GREEN = (0, 255, 0)
         BLUE = (0, 255, 255)
-
-        size = (800, 400)
-        screen = pygame.display.set_mode(size)
-        clock = pygame.time.Clock()
-        hanoi_surface = pygame.image.load('.\HanoiTower_v5.png') # type: ignore
+        COLORS = (BLUE, RED, GREEN)
+        X_OFFSET = (80, 300, 520)
 
         disk_height = 25
-        disk_width = 200    
+        disk_width = 200
 
-        screen.blit(hanoi_surface, (0, 0))
+        screen.blit(self._hanoi_surface, (0, 0))
 
         def initializeDisks(diskNumber, disk_height, disk_width):
             disks = []
@@ -188,20 +247,14 @@ class HanoiTower(gym.Env):
             return disks
             
         disk_info = initializeDisks(self.numDisks, disk_height, disk_width)
-        peg_0 = 0
-        peg_1 = 0
-        peg_2 = 0
-
-        for disk, peg in enumerate(self.agentState[::-1]):  # agentState reversed for proper rendering
-            if peg == 0:
-                pygame.draw.rect(screen, BLUE, (80 + (12.5 * disk), 329 - (25 * peg_0), disk_info[disk][0], disk_info[disk][1]))
-                peg_0 += 1
-            elif peg == 1:
-                pygame.draw.rect(screen, RED, (300 + (12.5 * disk), 329 - (25 * peg_1), disk_info[disk][0], disk_info[disk][1]))
-                peg_1 += 1
-            else:
-                pygame.draw.rect(screen, GREEN, (520 + (12.5 * disk), 329 - (25 * peg_2), disk_info[disk][0], disk_info[disk][1]))
-                peg_2 += 1
+        counts = [0, 0, 0]
+
+        for disk in range(self.numDisks):  # disks reversed for proper rendering
+            peg = (self.agentState // self._pow3[self.numDisks - 1 - disk]) % 3
+            x = X_OFFSET[peg] + (12.5 * disk)
+            y = 329 - (25 * counts[peg])
+            pygame.draw.rect(screen, COLORS[peg], (x, y, disk_info[disk][0], disk_info[disk][1]))
+            counts[peg] += 1
 
         pygame.display.update()
         clock.tick(60)
@@ -209,10 +262,70 @@ class HanoiTower(gym.Env):
 
 
     def close(self):
-        pygame.quit()
+        # pygame is only worth tearing down if render() ever initialized it.
+        if self._screen is not None:
+            pygame.quit()
+            self._screen = None
+
+class HanoiVectorEnv:
+    """
+    Vectorized view of several independent Tower of Hanoi games.
+
+    All games are stepped in lockstep against the base environment's
+    precomputed transition tables, so one `step` call advances every game
+    with a handful of array ops. Games that reach the goal are reset to the
+    start state in place (autoreset); the returned next states are the
+    pre-reset ones, so a learner still sees the terminal transition.
+
+    Args:
+        env (HanoiTower): Base environment with transition tables built.
+        numEnvs (int): Number of games to run in parallel.
+
+    Attributes:
+        states (np.ndarray): Current packed state of every game.
+        goalState (int): Packed integer index of the goal state.
+    """
+    def __init__(self, env, numEnvs):
+        self.env = env
+        self.numEnvs = numEnvs
+        self.goalState = env.goalState
+        self._next = env._next
+        self._reward = env._reward
+        self.states = np.zeros(numEnvs, dtype=np.int64)
+
+    def reset(self):
+        """
+        Reset every game to the initial state.
+
+        Returns:
+            np.ndarray: Array of packed start states, one per game.
+        """
+        self.states = np.zeros(self.numEnvs, dtype=np.int64)
+
+        return self.states
+
+    def step(self, actions):
+        """
+        Advance every game by one move.
+
+        Args:
+            actions (np.ndarray): Action index (0-5) per game.
+
+        Returns:
+            tuple: (next_states, rewards, dones) arrays, one entry per game.
+                Games whose next state is the goal are reset internally.
+        """
+        nextStates = self._next[self.states, actions]
+        rewards = self._reward[self.states, actions]
+        dones = nextStates == self.goalState
+        self.states = np.where(dones, 0, nextStates)
+
+        return nextStates, rewards, dones
+
 
 #Function that creates and instance of the environment
 def create_env(numDisks):
     env = HanoiTower(numDisks=numDisks)
+    env._buildTransitionTables()
 
     return env
\ No newline at end of file
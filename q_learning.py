@@ -7,19 +7,165 @@ Excploration vs Exploitation Used : Epsilon-Greedy with Decay
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from numba import njit, prange
 
-def train_q_learning(env, 
+from padm_env import HanoiVectorEnv
+
+RNG_BATCH = 4096
+N_AGENTS = 64
+ACTION_TO_MOVE = ((0, 1), (0, 2), (1, 0),
+                  (1, 2), (2, 0), (2, 1))
+REPLAY_CAPACITY = 8192
+REPLAY_BATCH = 256
+REPLAY_EVERY = 8
+LOG_INTERVAL = 100
+PARALLEL_ROUND_STEPS = 256
+
+
+@njit(parallel=True, cache=True)
+def run_parallel_agents(q_table, next_tbl, rew_tbl, goal_state, n_steps, epsilon, alpha, gamma, seeds):
+    """
+    Step one round of independent agents across CPU cores.
+
+    Each agent runs `n_steps` transitions against the static tables in its
+    own thread, accumulating Q-updates into a thread-local delta table so no
+    two threads write the shared Q-table concurrently. At the end of the
+    round the average of the agents' deltas is merged into the Q-table —
+    every agent walks the same handful of states, so summing the deltas
+    outright would apply roughly n_agents times the intended step to each
+    entry and diverge. Agents read a Q-table stale by at most one round.
+
+    Parameters:
+    -----------
+    q_table : np.ndarray
+        Q-table to update in place, shape (num_states, 6).
+    next_tbl, rew_tbl : np.ndarray
+        Precomputed next-state and reward tables from the environment.
+    goal_state : int
+        Packed integer index of the goal state.
+    n_steps : int
+        Number of transitions each agent runs this round.
+    epsilon, alpha, gamma : float
+        Q-learning hyperparameters, held fixed within the round.
+    seeds : np.ndarray
+        Per-agent RNG seeds for this round.
+
+    Returns:
+    --------
+    tuple
+        (episodes, rewards, solved_steps, min_steps) arrays with per-agent
+        completed episode counts, reward sums, steps spent in completed
+        episodes, and shortest completed episode.
+    """
+    n_agents = seeds.shape[0]
+    num_states = q_table.shape[0]
+    num_actions = q_table.shape[1]
+    deltas = np.zeros((n_agents, num_states, num_actions), dtype=np.float32)
+    episodes = np.zeros(n_agents, dtype=np.int64)
+    solved_steps = np.zeros(n_agents, dtype=np.int64)
+    rewards = np.zeros(n_agents)
+    min_steps = np.full(n_agents, 2**62, dtype=np.int64)
+
+    for k in prange(n_agents):
+        np.random.seed(seeds[k])
+        state = 0
+        ep_len = 0
+        for t in range(n_steps):
+            if np.random.random() < epsilon:
+                action = np.random.randint(0, num_actions)
+            else:
+                best_val = q_table[state, 0] + deltas[k, state, 0]
+                action = 0
+                for a in range(1, num_actions):
+                    val = q_table[state, a] + deltas[k, state, a]
+                    if val > best_val:
+                        best_val = val
+                        action = a
+
+            next_state = next_tbl[state, action]
+            reward = rew_tbl[state, action]
+            rewards[k] += reward
+            ep_len += 1
+
+            best_next = q_table[next_state, 0] + deltas[k, next_state, 0]
+            for a in range(1, num_actions):
+                val = q_table[next_state, a] + deltas[k, next_state, a]
+                if val > best_next:
+                    best_next = val
+            current = q_table[state, action] + deltas[k, state, action]
+            deltas[k, state, action] += alpha * (reward + gamma * best_next - current)
+
+            if next_state == goal_state:
+                terminal = q_table[next_state, action] + deltas[k, next_state, action]
+                deltas[k, next_state, action] += alpha * (reward - terminal)
+                episodes[k] += 1
+                solved_steps[k] += ep_len
+                if ep_len < min_steps[k]:
+                    min_steps[k] = ep_len
+                ep_len = 0
+                state = 0
+            else:
+                state = next_state
+
+    inv_agents = np.float32(1.0 / n_agents)
+    for k in range(n_agents):
+        q_table += deltas[k] * inv_agents
+
+    return episodes, rewards, solved_steps, min_steps
+
+
+def batch_update(q_table, states, actions, rewards, next_states, alpha, gamma, current=None):
+    """
+    Apply one Bellman update across a whole batch of transitions at once.
+
+    The tabular analog of fitting on a minibatch: the TD errors for every
+    transition are computed with array ops and accumulated into the Q-table
+    with a single np.add.at, which handles duplicate (state, action) pairs
+    correctly.
+
+    Parameters:
+    -----------
+    q_table : np.ndarray
+        Q-table to update in place.
+    states, actions : np.ndarray
+        Batch of state indices and action indices.
+    rewards, next_states : np.ndarray
+        Rewards and next-state indices for the batch.
+    alpha, gamma : float
+        Learning rate and discount factor.
+    current : np.ndarray, optional
+        Pre-gathered q_table[states, actions] values, if the caller already
+        has them; gathered here otherwise.
+
+    Returns:
+    --------
+    None
+    """
+    if current is None:
+        current = q_table[states, actions]
+    td = rewards + gamma * q_table[next_states].max(axis=1) - current
+    np.add.at(q_table, (states, actions), alpha * td)
+
+
+def train_q_learning(env,
                      no_episodes,
-                     epsilon, 
+                     epsilon,
                      epsilon_min,
-                     epsilon_decay, 
-                     alpha, 
-                     gamma, 
+                     epsilon_decay,
+                     alpha,
+                     gamma,
                      render,
+                     parallel=False,
                      q_table_save_path="q_table.npy"):
     """
     Trains a Q-learning agent to solve the Tower of Hanoi problem using the specified parameters.
 
+    When rendering is disabled, N_AGENTS independent games are stepped in
+    lockstep against the environment's precomputed transition tables, so each
+    timestep is a handful of vectorized array ops shared across all agents
+    instead of one interpreted env.step call per agent. Training stops once
+    `no_episodes` episodes have completed across all agents.
+
     Parameters:
     -----------
     env : Tower of Hanoi environment
@@ -36,6 +182,10 @@ def train_q_learning(env,
         Learning rate.
     gamma : float
         Discount factor.
+    parallel : bool, optional
+        Run agents across CPU cores with the Numba kernel instead of the
+        lockstep NumPy rollout. Only worthwhile for larger disk counts.
+        Default is False.
     q_table_save_path : str, optional
         File path to save the Q-table after training. Default is "q_table.npy".
 
@@ -43,86 +193,198 @@ def train_q_learning(env,
     --------
     None
     """
-    # Initialize Q-table with zeros
-    shape = (3**env.numDisks, env.actionSpace.n)
-    q_table = np.zeros(shape)
+    # Memory-map the Q-table straight into its .npy save file: updates land
+    # in place through the page cache instead of one big serialize at the
+    # end, and tables bigger than RAM would still work. open_memmap writes a
+    # valid .npy header, so np.load reads the result as usual.
+    shape = (3**env.numDisks, int(env.actionSpace.n))
+    q_table = np.lib.format.open_memmap(q_table_save_path, mode='w+',
+                                        dtype=np.float32, shape=shape)
+    alpha = np.float32(alpha)
+    gamma = np.float32(gamma)
     total_reward = 0
     steps = 0
     steps_list = []
     rewards_list = []
-    prev_step = 0
-    last_reward = 0
-    
-    
-    for episode in range(no_episodes):
-        state = env.reset()
-        actionToMove = [(0, 1), (0, 2), (1, 0),
-                    (1, 2), (2, 0), (2, 1)]
-        Exploration = 0
-        Exploitation = 0
-
-
-        while True:
-            if np.random.rand() < epsilon:
-                action = env.actionSpace.sample() #Exploration
-                Exploration += 1
-            else:
-                action = np.argmax(q_table[state_to_index(state)]) #Exploitation
-                Exploitation += 1
-            next_state, reward, done, info = env.step(actionToMove[action])
-            if render:
-                env.render() 
-
-            total_reward += reward
-            steps += 1
-            current_index = state_to_index(state)
-            next_index = state_to_index(next_state)
-
-            q_table[current_index][action] = q_table[current_index][action] + alpha * \
-                (reward + gamma * (np.max(q_table[next_index])) - q_table[current_index][action])
-
-            state = next_state
-
-            if done:
-                steps_list.append(steps - prev_step)
-                prev_step = steps
-                rewards_list.append(total_reward - last_reward)
-                last_reward = total_reward
-                q_table[next_index][action] = q_table[next_index][action] + alpha * (reward - q_table[next_index][action])
-                print()
-                break
-    
-        epsilon = max(epsilon_min, epsilon * epsilon_decay)
-        print(f"Episode {episode + 1}, Total Reward: {total_reward}, Explored: {Exploration}, Exploited: {Exploitation}")
+    parallel_min_steps = 2**62
+
+    # Precompute the whole epsilon decay schedule up front; episode i just
+    # indexes into it instead of re-evaluating the decay and clamp.
+    eps_schedule = np.maximum(epsilon_min,
+                              epsilon * np.power(epsilon_decay,
+                                                 np.arange(no_episodes, dtype=np.float32)))
+
+    # Batch random draws so the per-step cost is an array index instead of
+    # an RNG call; the buffers are refilled when exhausted.
+    rng = np.random.default_rng()
+
+    if render:
+        # Rendering needs the env stepped from Python, so keep the
+        # interpreted per-episode loop for that case.
+        rand_buf = rng.random(RNG_BATCH)
+        action_buf = rng.integers(0, env.actionSpace.n, RNG_BATCH)
+        buf_pos = 0
+
+        for episode in range(no_episodes):
+            state = env.reset()
+            epsilon = eps_schedule[episode]
+            Exploration = 0
+            Exploitation = 0
+            ep_steps = 0
+            ep_reward = 0.0
+
+            while True:
+                if buf_pos == RNG_BATCH:
+                    rand_buf = rng.random(RNG_BATCH)
+                    action_buf = rng.integers(0, env.actionSpace.n, RNG_BATCH)
+                    buf_pos = 0
+
+                if rand_buf[buf_pos] < epsilon:
+                    action = action_buf[buf_pos] #Exploration
+                    Exploration += 1
+                else:
+                    action = q_table[state].argmax() #Exploitation
+                    Exploitation += 1
+                buf_pos += 1
+                next_state, reward, done, info = env.step(ACTION_TO_MOVE[action])
+                env.render()
+
+                ep_reward += reward
+                ep_steps += 1
+                # Bind the two Q-table rows once; repeated q_table[index]
+                # lookups on 6-element rows are pure call overhead.
+                row = q_table[state]
+                next_row = q_table[next_state]
+
+                row[action] = row[action] + alpha * \
+                    (reward + gamma * next_row.max() - row[action])
+
+                state = next_state
+
+                if done:
+                    next_row[action] = next_row[action] + alpha * (reward - next_row[action])
+                    break
+
+            total_reward += ep_reward
+            steps += ep_steps
+            steps_list.append(ep_steps)
+            rewards_list.append(ep_reward)
+
+            if (episode + 1) % LOG_INTERVAL == 0:
+                print(f"Episode {episode + 1}, Total Reward: {total_reward}, Explored: {Exploration}, Exploited: {Exploitation}")
+    elif parallel:
+        next_tbl = env._next
+        rew_tbl = env._reward
+        episodes_done = 0
+        last_logged = 0
+        epsilon = eps_schedule[0]
+
+        while episodes_done < no_episodes:
+            seeds = rng.integers(0, 2**31 - 1, N_AGENTS)
+            ep_counts, reward_sums, solved_steps, min_eps = run_parallel_agents(
+                q_table, next_tbl, rew_tbl, env.goalState, PARALLEL_ROUND_STEPS,
+                epsilon, alpha, gamma, seeds)
+
+            episodes_done += int(ep_counts.sum())
+            total_reward += reward_sums.sum()
+            # Only steps that belong to completed episodes count toward the
+            # steps-to-solve average.
+            steps += int(solved_steps.sum())
+            if ep_counts.sum() > 0:
+                parallel_min_steps = min(parallel_min_steps, int(min_eps.min()))
+            epsilon = eps_schedule[min(episodes_done, no_episodes - 1)]
+            if episodes_done // LOG_INTERVAL > last_logged // LOG_INTERVAL:
+                print(f"Episode {min(episodes_done, no_episodes)}, Total Reward: {total_reward}")
+                last_logged = episodes_done
+    else:
+        next_tbl = env._next
+        rew_tbl = env._reward
+
+        vec_env = HanoiVectorEnv(env, N_AGENTS)
+        states = vec_env.reset()
+        agent_idx = np.arange(N_AGENTS)
+        ep_steps = np.zeros(N_AGENTS, dtype=np.int64)
+        ep_rewards = np.zeros(N_AGENTS)
+        explored = np.zeros(N_AGENTS, dtype=np.int64)
+        exploited = np.zeros(N_AGENTS, dtype=np.int64)
+        episodes_done = 0
+        epsilon = eps_schedule[0]
+
+        # Experience replay: transitions are deterministic, so a replayed
+        # sample is just a (state, action) pair — next state and reward are
+        # looked up from the static tables at replay time.
+        replay_s = np.empty(REPLAY_CAPACITY, dtype=np.int32)
+        replay_a = np.empty(REPLAY_CAPACITY, dtype=np.int8)
+        replay_head = 0
+        replay_fill = 0
+        timestep = 0
+
+        while episodes_done < no_episodes:
+            # Gather the agents' Q-rows once and reuse them for both the
+            # greedy action choice and the TD error.
+            q_rows = q_table[states]
+            explore_mask = rng.random(N_AGENTS) < epsilon
+            actions = np.where(explore_mask,
+                               rng.integers(0, env.actionSpace.n, N_AGENTS),
+                               q_rows.argmax(axis=1))
+            explored += explore_mask
+            exploited += ~explore_mask
+
+            next_states, rewards, done = vec_env.step(actions)
+            ep_rewards += rewards
+            ep_steps += 1
+
+            batch_update(q_table, states, actions, rewards, next_states,
+                         alpha, gamma, current=q_rows[agent_idx, actions])
+
+            write_idx = (replay_head + agent_idx) % REPLAY_CAPACITY
+            replay_s[write_idx] = states
+            replay_a[write_idx] = actions
+            replay_head = (replay_head + N_AGENTS) % REPLAY_CAPACITY
+            replay_fill = min(replay_fill + N_AGENTS, REPLAY_CAPACITY)
+
+            timestep += 1
+            if timestep % REPLAY_EVERY == 0 and replay_fill >= REPLAY_BATCH:
+                sample = rng.integers(0, replay_fill, REPLAY_BATCH)
+                s_batch = replay_s[sample]
+                a_batch = replay_a[sample]
+                ns_batch = next_tbl[s_batch, a_batch]
+                r_batch = rew_tbl[s_batch, a_batch]
+                batch_update(q_table, s_batch, a_batch, r_batch, ns_batch, alpha, gamma)
+
+            if done.any():
+                finished = np.nonzero(done)[0]
+                np.add.at(q_table, (next_states[finished], actions[finished]),
+                          alpha * (rewards[finished] - q_table[next_states[finished], actions[finished]]))
+
+                for agent in finished:
+                    episodes_done += 1
+                    total_reward += ep_rewards[agent]
+                    steps += ep_steps[agent]
+                    steps_list.append(int(ep_steps[agent]))
+                    rewards_list.append(ep_rewards[agent])
+                    if episodes_done % LOG_INTERVAL == 0:
+                        print(f"Episode {episodes_done}, Total Reward: {total_reward}, Explored: {explored[agent]}, Exploited: {exploited[agent]}")
+                    if episodes_done == no_episodes:
+                        break
+                epsilon = eps_schedule[min(episodes_done, no_episodes - 1)]
+
+                # The vector env autoresets finished games; only the
+                # per-episode bookkeeping needs clearing here.
+                ep_steps[finished] = 0
+                ep_rewards[finished] = 0.0
+                explored[finished] = 0
+                exploited[finished] = 0
+
+            states = vec_env.states
 
     env.close()
     print("------------------------")
     print(" Learning is completed.")
     print("------------------------")
-    print(f"Average Rewards per Episode: {total_reward/no_episodes},Average Number of Steps to Solve: {steps/no_episodes}, Minimum Steps: {min(steps_list)}")
-    np.save(q_table_save_path, q_table)
+    min_steps = min(steps_list) if steps_list else parallel_min_steps
+    print(f"Average Rewards per Episode: {total_reward/no_episodes},Average Number of Steps to Solve: {steps/no_episodes}, Minimum Steps: {min_steps}")
+    q_table.flush()
     print("------------------------")
     print(f"Q-table saved to {q_table_save_path}")
 
-
-def state_to_index(state):
-    """
-    Converts the state representation of the Tower of Hanoi environment into an index for the Q-table.
-
-    Parameters:
-    -----------
-    state : tuple
-        The state of the environment, representing the configuration of disks on pegs.
-
-    Returns:
-    --------
-    index : int
-        Index corresponding to the state in the Q-table.
-    """
-    index = 0
-    num_pegs = len(state)
-    
-    for i, disk in enumerate(state):
-        index += disk * (3 ** (num_pegs - i - 1))
-    
-    return index
\ No newline at end of file